@@ -1,39 +1,69 @@
-import hydrus_api, os, json, math
+import asyncio, hydrus_api, os, json, math, functools, re, reprlib, threading, time
+from collections import Counter, OrderedDict
+from concurrent.futures import ThreadPoolExecutor
 import numpy as np
 from typing import Any
 
 import httpx
 
 
+def strip_quotes(value: str) -> str:
+    """Strip one pair of matching outer quotes ("x" or 'x') — models often send quoted strings."""
+    return value[1:-1] if len(value) >= 2 and value[0] in "\"'" and value[-1] == value[0] else value
+
+
+def _clients_secret() -> str:
+    """Raw HYDRUS_CLIENTS value — the cache key for the parsed client list."""
+    return os.environ.get("HYDRUS_CLIENTS", "[]").strip()
+
+
+def _parse_clients(clients_secret: str) -> list[dict[str, str]]:
+    """Parse a HYDRUS_CLIENTS payload into client dicts ([] if it isn't valid)."""
+    try:
+        clients = json.loads(clients_secret)
+        # Each entry is [name, url, apikey] with an optional 4th description
+        return [
+            {"name": c[0], "url": c[1], "apikey": c[2], "description": c[3] if len(c) > 3 else ""}
+            for c in clients if isinstance(c, list) and len(c) >= 3
+        ]
+    except (json.JSONDecodeError, TypeError):
+        return []
+
+
+# (raw secret, parsed clients, lowercased name -> client, "name1, name2" for error messages).
+# Rebuilt only when the secret changes, so steady-state tool calls skip the JSON decode; the lock
+# makes concurrent first calls parse once.
+_CLIENTS_CACHE: tuple[str, list[dict[str, str]], dict[str, dict[str, str]], str] | None = None
+_clients_lock = threading.Lock()
+
+
+def _clients_cache() -> tuple[list[dict[str, str]], dict[str, dict[str, str]], str]:
+    global _CLIENTS_CACHE
+    clients_secret = _clients_secret()
+    cache = _CLIENTS_CACHE
+    if cache is None or cache[0] != clients_secret:
+        with _clients_lock:
+            cache = _CLIENTS_CACHE
+            if cache is None or cache[0] != clients_secret:
+                clients = _parse_clients(clients_secret)
+                # Built in reverse so the FIRST entry wins on duplicate names, as the old scan did
+                by_name = {client["name"].lower(): client for client in reversed(clients)}
+                names = ", ".join(client["name"] for client in clients)
+                cache = _CLIENTS_CACHE = (clients_secret, clients, by_name, names)
+    return cache[1], cache[2], cache[3]
+
+
+# (url, apikey) -> constructed client, shared across tool calls
+_CLIENT_INSTANCES: dict[tuple[str, str], hydrus_api.Client] = {}
+
+
 def load_clients_from_secret() -> list[dict[str, str]]:
     """Load client credentials from environment variable
     
     Returns:
         List of client dictionaries with name, url, apikey, and description
     """
-    clients_secret = os.environ.get("HYDRUS_CLIENTS", "[]").strip()
-    
-    try:
-        clients = json.loads(clients_secret)
-        
-        valid_clients: list[dict[str, str]] = []
-        for client in clients:
-            if len(client) >= 3:
-                client_name = client[0]
-                url = client[1]
-                apikey = client[2]
-                description = client[3] if len(client) > 3 else ""
-                
-                valid_clients.append({
-                    "name": client_name,
-                    "url": url,
-                    "apikey": apikey,
-                    "description": description
-                })
-        
-        return valid_clients
-    except (json.JSONDecodeError, TypeError):
-        return []
+    return _clients_cache()[0]
 
 
 def get_client_by_name(client_name: str) -> hydrus_api.Client | None:
@@ -49,16 +79,121 @@ def get_client_by_name(client_name: str) -> hydrus_api.Client | None:
         return None
     
     # Strip quotes from client name (models often send quoted strings)
-    client_name_stripped = client_name.strip()
-    if (client_name_stripped.startswith('"') and client_name_stripped.endswith('"')) or \
-       (client_name_stripped.startswith("'") and client_name_stripped.endswith("'")):
-        client_name_stripped = client_name_stripped[1:-1]
+    client_name_stripped = strip_quotes(client_name.strip())
     
+    client = _clients_cache()[1].get(client_name_stripped.lower())
+    if client is None:
+        return None
+    # Reuse one instance per (url, apikey): it owns a requests.Session, and a fresh one per call
+    # throws away the keep-alive connection pool (TCP/TLS handshake on every tool call)
+    instance_key = (client["url"], client["apikey"])
+    instance = _CLIENT_INSTANCES.get(instance_key)
+    if instance is None:
+        instance = _CLIENT_INSTANCES[instance_key] = hydrus_api.Client(
+            access_key=client["apikey"], api_url=client["url"])
+    return instance
+
+
+# Worker threads per Hydrus client URL for call_hydrus. A dedicated pool per client means a slow or
+# hung instance only ties up its own threads, not the loop's default executor used by every other
+# client and blocking call.
+_HYDRUS_WORKERS = 16
+_EXECUTORS: dict[str, ThreadPoolExecutor] = {}
+
+
+async def call_hydrus(client_obj: hydrus_api.Client, fn, /, *args, **kwargs):
+    """Run blocking fn(*args, **kwargs) in client_obj's own thread pool and await the result.
+
+    Every tool's Hydrus calls go through here rather than asyncio.to_thread.
+    """
+    executor = _EXECUTORS.get(client_obj.api_url)
+    if executor is None:
+        executor = _EXECUTORS[client_obj.api_url] = ThreadPoolExecutor(
+            max_workers=_HYDRUS_WORKERS, thread_name_prefix="hydrus")
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(executor, functools.partial(fn, *args, **kwargs))
+
+
+def reload_clients() -> list[dict[str, str]]:
+    """Drop the cached client list, client instances and service keys, then re-read HYDRUS_CLIENTS
+    (thread pools of clients no longer listed are shut down)
+
+    Returns:
+        The freshly loaded list of client dictionaries
+    """
+    global _CLIENTS_CACHE
+    with _clients_lock:
+        _CLIENTS_CACHE = None
+        # Not closed: a tool call may still be mid-request on one; the old sessions are simply
+        # dropped with their last reference
+        _CLIENT_INSTANCES.clear()
+    _SERVICE_KEY_CACHE.clear()
+    _PAGES_CACHE.clear()
+    clear_search_cache()
     clients = load_clients_from_secret()
-    for client in clients:
-        if client["name"].lower() == client_name_stripped.lower():
-            return hydrus_api.Client(access_key=client["apikey"], api_url=client["url"])
-    return None
+    # Retire the pools of clients that are no longer configured; wait=False lets calls already
+    # running in them finish
+    configured = {client["url"].rstrip("/") for client in clients}  # as hydrus_api.Client stores it
+    for api_url in [url for url in _EXECUTORS if url not in configured]:
+        _EXECUTORS.pop(api_url).shutdown(wait=False)
+    return clients
+
+
+# (api_url, canonical search params) -> (time.monotonic() of the fetch, search_files response).
+# LLM workflows re-run the same search within seconds ("files with X", then "...now their tags"),
+# so identical searches reuse a response for a short TTL; least recently used entries go first.
+# Tools that change files or tags clear it. Searches with system: predicates are never cached:
+# inbox, import time, file counts and the like change without any tool here touching them.
+_SEARCH_CACHE: OrderedDict[tuple[str, str], tuple[float, Any]] = OrderedDict()
+_SEARCH_CACHE_SIZE = 512
+_SEARCH_CACHE_TTL = 30.0
+_search_cache_lock = threading.Lock()
+# Bumped by clear_search_cache: a search that started before a clear must not store its
+# (possibly pre-change) response after it
+_search_cache_generation = 0
+
+
+def _has_system_predicate(tags) -> bool:
+    """True if any tag (OR groups included) is a system: predicate."""
+    if isinstance(tags, str):
+        return tags.strip().lower().startswith("system:")
+    if isinstance(tags, (list, tuple)):
+        return any(_has_system_predicate(tag) for tag in tags)
+    return False
+
+
+def search_files_cached(client_obj: hydrus_api.Client, **search_params) -> Any:
+    """client_obj.search_files(**search_params), reusing the response to an identical search made
+    within the last _SEARCH_CACHE_TTL seconds. Random-sorted searches and searches with system:
+    predicates are never cached."""
+    if (search_params.get("file_sort_type") == 4  # FILE_SORT_RANDOM: a repeat must reshuffle
+            or _has_system_predicate(search_params.get("tags"))):
+        return client_obj.search_files(**search_params)
+    key = (client_obj.api_url, json.dumps(search_params, sort_keys=True, default=str))
+    with _search_cache_lock:
+        hit = _SEARCH_CACHE.get(key)
+        if hit is not None and time.monotonic() - hit[0] <= _SEARCH_CACHE_TTL:
+            _SEARCH_CACHE.move_to_end(key)
+            return hit[1]
+        generation = _search_cache_generation
+    fetched_at = time.monotonic()
+    response = client_obj.search_files(**search_params)
+    with _search_cache_lock:
+        if generation != _search_cache_generation:
+            return response  # the cache was cleared mid-search; this result may predate the change
+        _SEARCH_CACHE[key] = (fetched_at, response)
+        _SEARCH_CACHE.move_to_end(key)
+        while len(_SEARCH_CACHE) > _SEARCH_CACHE_SIZE:
+            _SEARCH_CACHE.popitem(last=False)
+    return response
+
+
+def clear_search_cache() -> None:
+    """Forget cached search results (after changing tags, searches may match different files)."""
+    global _search_cache_generation
+    with _search_cache_lock:
+        _SEARCH_CACHE.clear()
+        _search_cache_generation += 1
 
 
 def get_page_info(client_obj: hydrus_api.Client, page_key: str) -> dict | None:
@@ -66,16 +201,55 @@ def get_page_info(client_obj: hydrus_api.Client, page_key: str) -> dict | None:
     return client_obj.get_page_info(page_key=page_key)
 
 
-def get_service_key_by_name(client: hydrus_api.Client, service_name: str) -> str | None:
-    """Get the service key for a given service name"""
+# api_url -> (time.monotonic() of its last get_services(), {service name: service key}). A Hydrus
+# install's services are effectively static, so one get_services() round-trip fills in EVERY name
+# it returns, not just the one asked for. Each client's entry is replaced whole in one assignment,
+# so readers never see a half-updated mapping and no client's refresh touches another's names.
+# Entries older than the TTL are re-fetched, so a service renamed or removed in Hydrus stops
+# resolving to its old key.
+_SERVICE_KEY_CACHE: dict[str, tuple[float, dict[str, str]]] = {}
+_SERVICE_KEY_TTL = 300.0
+# api_url -> lock single-flighting get_services() for that client
+_service_locks: dict[str, threading.Lock] = {}
+
+
+def _service_lock(client: hydrus_api.Client) -> threading.Lock:
+    return _service_locks.setdefault(client.api_url, threading.Lock())
+
+
+def _services_refresh(client: hydrus_api.Client) -> dict[str, str]:
+    """Re-fetch the client's services, replace its service-key cache entry and return the names."""
     services_dict = client.get_services()
+    names: dict[str, str] = {}
     for key, service_info in services_dict["services"].items():
-        if service_info["name"] == service_name:
-            return key
-    return None
+        # setdefault keeps the first match, as the old scan did on duplicate names
+        names.setdefault(service_info["name"], key)
+    _SERVICE_KEY_CACHE[client.api_url] = (time.monotonic(), names)
+    return names
+
+
+def _cached_services(client: hydrus_api.Client) -> dict[str, str] | None:
+    """The client's cached {name: key}, or None if it was never fetched or is past the TTL."""
+    entry = _SERVICE_KEY_CACHE.get(client.api_url)
+    if entry is None or time.monotonic() - entry[0] > _SERVICE_KEY_TTL:
+        return None
+    return entry[1]
 
 
-def _file_tags(item, tag_service_key):
+def get_service_key_by_name(client: hydrus_api.Client, service_name: str) -> str | None:
+    """Get the service key for a given service name (cached per client URL for _SERVICE_KEY_TTL)"""
+    names = _cached_services(client)
+    if names is None or service_name not in names:
+        with _service_lock(client):
+            # Re-check: a concurrent caller may have refreshed the cache while we waited
+            names = _cached_services(client)
+            if names is None or service_name not in names:
+                # Unknown names always re-check, so a service added since the last fetch is found
+                names = _services_refresh(client)
+    return names.get(service_name)
+
+
+def _file_tags(item, svc_key):
     """A file's tags for a service from a file_metadata item. Hydrus keeps tags under two halves
     — `storage_tags` (raw) and `display_tags` (siblings/parents applied, computed ASYNCHRONOUSLY)
     — each split by status ('0' current, '1' pending, '2' deleted, ...). Reading only the fixed
@@ -83,37 +257,87 @@ def _file_tags(item, tag_service_key):
     hasn't materialised yet (their tags are still pending, or display sync hasn't run). Prefer
     current storage, then current display, then pending — so a file with tags in ANY of those is
     counted. The 2,963 already-current files are unchanged (current storage stays primary)."""
-    svc = ((item.get("tags") or {}).get(str(tag_service_key)) or {})
+    svc = ((item.get("tags") or {}).get(svc_key) or {})
     storage = svc.get("storage_tags") or {}
     display = svc.get("display_tags") or {}
     return (storage.get("0") or display.get("0") or storage.get("1") or display.get("1") or [])
 
 
+# Default concurrent get_file_metadata requests per tag fetch (get_tags/get_tags_summary take a
+# max_workers override; 1 fetches sequentially). The work is pure HTTP wait, so threads overlap
+# the round-trips instead of stacking them one after another.
+_METADATA_WORKERS = 16
+# api_url -> slots bounding that client's in-flight get_file_metadata requests to
+# _METADATA_WORKERS in total. get_tags calls already run concurrently in the client's call_hydrus
+# pool, and each fans out again; without a shared bound one client could see 16 x 16 requests.
+_metadata_slots: dict[str, threading.BoundedSemaphore] = {}
+
+# Errors worth retrying as-is: the connection dropped or the client DB is busy (HTTP 503).
+_TRANSIENT_ERRORS = (hydrus_api.ConnectionError, hydrus_api.DatabaseLocked)
+
+
+def retry_transient(fn, /, *args, retries: int = 2, backoff: float = 0.5, **kwargs):
+    """fn(*args, **kwargs), retried up to `retries` times with exponential backoff (backoff,
+    2*backoff, ...) when it raises a transient Hydrus error. Blocking: run it off the event loop."""
+    for attempt in range(retries + 1):
+        try:
+            return fn(*args, **kwargs)
+        except _TRANSIENT_ERRORS:
+            if attempt == retries:
+                raise
+            time.sleep(backoff * 2 ** attempt)
+
+
 def _fetch_metadata(client_obj, file_ids):
-    a = client_obj.get_file_metadata(file_ids=file_ids)
-    return a.get("metadata") or []
+    slots = _metadata_slots.setdefault(client_obj.api_url, threading.BoundedSemaphore(_METADATA_WORKERS))
 
+    def fetch():
+        # A slot per attempt, not across the retries: a backoff sleep doesn't hold one
+        with slots:
+            return client_obj.get_file_metadata(file_ids=file_ids)
 
-def get_tags(client_obj: hydrus_api.Client, file_ids: list[int], tag_service: str = "all known tags") -> list[list[Any]]:
-    tag_service_key = get_service_key_by_name(client_obj, tag_service)
+    a = retry_transient(fetch)
+    return a.get("metadata") or []
 
-    # Process in batches of 3
-    batch_size = 3
-    MyDict: list[list[Any]] = []
 
-    for i in range(0, len(file_ids), batch_size):
-        batch_file_ids = file_ids[i : i + batch_size]
-        try:
-            metadata = _fetch_metadata(client_obj, batch_file_ids)
-        except Exception:
-            # One bad/invalid id can make get_file_metadata raise for the whole batch — retry each
-            # file alone so its batchmates aren't lost with it.
-            metadata = []
-            for fid in batch_file_ids:
-                try:
-                    metadata.extend(_fetch_metadata(client_obj, [fid]))
-                except Exception as e:
-                    MyDict.append([fid, [f"(unreadable: {e})"]])
+def _fetch_batch(client_obj, batch_file_ids):
+    """Metadata for one batch, as (metadata, failures) where failures is [(file_id, error)]."""
+    try:
+        return _fetch_metadata(client_obj, batch_file_ids), []
+    except _TRANSIENT_ERRORS as e:
+        # Already retried — the server, not an id, is the problem; don't hammer it per file.
+        return [], [(fid, e) for fid in batch_file_ids]
+    except Exception:
+        # One bad/invalid id can make get_file_metadata raise for the whole batch — retry each
+        # file alone so its batchmates aren't lost with it.
+        metadata, failures = [], []
+        for fid in batch_file_ids:
+            try:
+                metadata.extend(_fetch_metadata(client_obj, [fid]))
+            except Exception as e:
+                failures.append((fid, e))
+        return metadata, failures
+
+
+def _fetch_batches(client_obj, file_ids, batch_size, max_workers=_METADATA_WORKERS):
+    """Yield _fetch_batch results for consecutive batches of file_ids, in input order. Batches
+    are requested concurrently on up to max_workers threads; pool.map keeps the results ordered."""
+    batches = [file_ids[i:i + batch_size] for i in range(0, len(file_ids), batch_size)]
+    if len(batches) <= 1 or max_workers <= 1:
+        for batch in batches:
+            yield _fetch_batch(client_obj, batch)
+        return
+    with ThreadPoolExecutor(max_workers=min(max_workers, len(batches))) as pool:
+        yield from pool.map(functools.partial(_fetch_batch, client_obj), batches)
+
+
+def _iter_file_tags(client_obj, file_ids, svc_key, batch_size=256, max_workers=_METADATA_WORKERS):
+    """Yield (file_id, tags, item) for every requested file — the shared fetch behind get_tags and
+    get_tags_summary. A file whose metadata couldn't be read yields (file_id, None, error)."""
+    # get_file_metadata takes hundreds of ids per request; batching only bounds URL/response size
+    for metadata, failures in _fetch_batches(client_obj, file_ids, batch_size, max_workers):
+        for fid, e in failures:
+            yield fid, None, e
 
         # Iterate the actual per-file metadata list. (The old code looped `range(len(a))`,
         # where `a` is the response WRAPPER — {"metadata": [...], "services": {...}} — so the
@@ -121,78 +345,86 @@ def get_tags(client_obj: hydrus_api.Client, file_ids: list[int], tag_service: st
         # or mis-paired files. Each metadata item already carries its own file_id.)
         for item in metadata:
             if isinstance(item, dict):
-                MyDict.append([item.get("file_id"), _file_tags(item, tag_service_key)])
-
-    return MyDict
-
-
+                yield item.get("file_id"), _file_tags(item, svc_key), item
+
+
+def get_tags(client_obj: hydrus_api.Client, file_ids: list[int], tag_service: str = "all known tags",
+             batch_size: int = 256, max_workers: int = _METADATA_WORKERS) -> list[list[Any]]:
+    # Resolved once: str() of the key is loop-invariant, so it's not rebuilt per file
+    svc_key = str(get_service_key_by_name(client_obj, tag_service))
+
+    # Pre-sized and filled by input position, so rows come back in file_ids order however the
+    # batches and per-file retries interleave (a failed file no longer jumps ahead of its batch)
+    slot: dict[Any, int] = {}
+    for i, fid in enumerate(file_ids):
+        slot.setdefault(fid, i)  # a repeated id keeps its first position
+    MyDict: list[list[Any] | None] = [None] * len(file_ids)
+    unexpected: list[list[Any]] = []  # ids the response didn't map back to a free slot
+    slot_get = slot.get  # bound once, not looked up per file
+    last_error, error_tags = None, None
+    for fid, tags, item in _iter_file_tags(client_obj, file_ids, svc_key, batch_size, max_workers):
+        if tags is None:
+            # A failed batch yields the same exception for each of its files: format it once
+            if item is not last_error:
+                last_error, error_tags = item, [f"(unreadable: {item})"]
+            tags = error_tags
+        row = [fid, tags]
+        i = slot_get(fid)
+        if i is None or MyDict[i] is not None:
+            unexpected.append(row)
+        else:
+            MyDict[i] = row
+    return [row for row in MyDict if row is not None] + unexpected
 
-def get_tags_summary(client_obj, file_ids, tag_service=None, result_limit=None):
-    if tag_service:
-        tag_service_key = get_service_key_by_name(client_obj, tag_service)
-    else:
-        tag_service_key = get_service_key_by_name(client_obj, "all known tags")
 
-    svc_key = str(tag_service_key)
+def get_tags_summary(client_obj, file_ids, tag_service=None, result_limit=None, batch_size=256,
+                     max_workers=_METADATA_WORKERS):
+    svc_key = str(get_service_key_by_name(client_obj, tag_service or "all known tags"))
 
-    # Process in batches of 3
-    batch_size = 3
-    tag_counts: dict[str, int] = {}
+    tag_counts: Counter[str] = Counter()
     counted = 0          # files whose metadata we actually read
     no_metadata = 0      # get_file_metadata returned nothing for these (even retried alone)
     empty: list[Any] = []        # read OK but the expected current-tags path yielded nothing
     empty_sample: list[dict] = []  # structure of the first few `empty` files, for diagnosis
+    count_tags = tag_counts.update  # bound once, not looked up per file
 
-    for i in range(0, len(file_ids), batch_size):
-        batch_file_ids = file_ids[i:i + batch_size]
-        try:
-            metadata = _fetch_metadata(client_obj, batch_file_ids)
-        except Exception:
-            # one bad id can poison the whole batch — retry each file alone so batchmates survive
-            metadata = []
-            for fid in batch_file_ids:
-                try:
-                    metadata.extend(_fetch_metadata(client_obj, [fid]))
-                except Exception:
-                    no_metadata += 1
-
-        for item in metadata:
-            if not isinstance(item, dict):
-                continue
+    for fid, tags, item in _iter_file_tags(client_obj, file_ids, svc_key, batch_size, max_workers):
+        if tags is None:
+            no_metadata += 1
+        else:
             counted += 1
-            tags = _file_tags(item, svc_key)
             if tags:
-                for tag in tags:
-                    tag_counts[tag] = tag_counts.get(tag, 0) + 1
+                count_tags(tags)
             else:
                 # Metadata is present but tags[svc_key]["storage_tags"]["0"] gave nothing. Don't
                 # guess why — record what IS there (is the expected service key present? which tag
                 # statuses exist?) so a genuine gap is DIAGNOSED rather than silently swallowed.
-                empty.append(item.get("file_id"))
+                empty.append(fid)
                 if len(empty_sample) < 8:
                     all_tags = item.get("tags") or {}
                     svc = all_tags.get(svc_key) or {}
                     empty_sample.append({
-                        "file_id": item.get("file_id"),
+                        "file_id": fid,
                         "has_expected_service_key": svc_key in all_tags,
                         "service_keys_present": list(all_tags.keys()),
                         "storage_tags_statuses": list((svc.get("storage_tags") or {}).keys()),
                         "display_tags_statuses": list((svc.get("display_tags") or {}).keys()),
                     })
 
-    # Convert to list of [tag, count] pairs sorted by count (highest to lowest)
-    result = [[tag, count] for tag, count in tag_counts.items()]
-    result.sort(key=lambda x: x[1], reverse=True)  # Sort by count descending
-
-    # Apply result_limit if provided and valid
+    # Apply result_limit if provided and valid — most_common(k) is a heap top-k, so a small limit
+    # never sorts the full tag set
+    top_k = None
     if result_limit is not None:
         try:
             result_limit_int = int(result_limit)
-            if result_limit_int > 0 and len(result) > result_limit_int:
-                result = result[:result_limit_int]
+            if result_limit_int > 0:
+                top_k = result_limit_int
         except (ValueError, TypeError):
             pass
 
+    # List of [tag, count] pairs sorted by count (highest to lowest)
+    result = [[tag, count] for tag, count in tag_counts.most_common(top_k)]
+
     # Returns (rows, diag). diag fully accounts for every requested file and, when some come back
     # without tags, samples their actual structure so the caller can report WHY rather than excuse
     # them silently.
@@ -201,191 +433,129 @@ def get_tags_summary(client_obj, file_ids, tag_service=None, result_limit=None):
         "counted": counted,
         "no_metadata": no_metadata,
         "empty_tags": len(empty),
+        "distinct_tags": len(tag_counts),  # before result_limit is applied
         "expected_service_key": svc_key,
         "empty_sample": empty_sample,
     }
     return result, diag
 
-def parse_hydrus_tags(query, additional_tags=None):
-            """Parse Hydrus query string into proper tag structure
-
-            Args:
-                query: The query string to parse
-                additional_tags: Optional list of tags to append to the result
-            """
-            if isinstance(query, list):
-                # Handle list inputs directly - convert to consistent string format
-                result = []
-                for item in query:
-                    if isinstance(item, str):
-                        # For strings, parse normally but preserve complex tags and strip quotes
-                        parsed = parse_hydrus_tags(item)
-                        if isinstance(parsed, list):
-                            processed_tags = []
-                            for tag in parsed:
-                                if isinstance(tag, str):
-                                    # Check if this is a quoted string and strip the quotes
-                                    stripped_tag = tag
-                                    if (tag.startswith('"') and tag.endswith('"')) or \
-                                       (tag.startswith("'") and tag.endswith("'")):
-                                        stripped_tag = tag[1:-1]
-                                    processed_tags.append(stripped_tag)
-                                else:
-                                    processed_tags.append(tag)
-                            result.extend(processed_tags if processed_tags else parsed)
-                        else:
-                            result.extend(parsed)
-                    elif isinstance(item, list):
-                        # For nested lists, recurse and convert to string format
-                        parsed = parse_hydrus_tags(item)
-                        if isinstance(parsed, list) and len(parsed) == 1:
-                            result.append(parsed[0])
-                        else:
-                            result.append(parsed)
-
-                # Append additional tags if provided
-                if additional_tags:
-                    if not isinstance(additional_tags, list):
-                        additional_tags = [additional_tags]
-                    result.extend(additional_tags)
-
-                return result
-            elif not query or query == "[]":
-                result = []
-                if additional_tags:
-                    if not isinstance(additional_tags, list):
-                        additional_tags = [additional_tags]
-                    result.extend(additional_tags)
-                return result
-
-            if isinstance(query, str):
-                # First, check for OR groups marked by brackets
-                has_or_groups = '[' in query and ']' in query
-
-                if has_or_groups:
-                    # Handle OR groups: [tag1, tag2] means OR condition
-                    tags = []
-                    current_tag = ''
-                    or_group = False
-                    or_tags = []
-
-                    for char in query:
-                        if char == '[' and not or_group:
-                            or_group = True
-                            or_tags = []
-                        elif char == ']' and or_group:
-                            or_group = False
-                            # Parse the contents of the OR group properly
-                            parsed_or_tags = parse_hydrus_tags(current_tag)
-                            tags.append(parsed_or_tags)
-                            current_tag = ''
-                        elif char == ',' and not or_group:
-                            if current_tag.strip():
-                                # Strip quotes from main tags (outside OR groups)
-                                stripped_tag = current_tag.strip()
-                                if (stripped_tag.startswith('"') and stripped_tag.endswith('"')) or \
-                                   (stripped_tag.startswith("'") and stripped_tag.endswith("'")):
-                                    stripped_tag = stripped_tag[1:-1]
-                                tags.append(stripped_tag)
-                                current_tag = ''
-                        else:
-                            current_tag += char
-
-                    if current_tag.strip():
-                        # Handle any remaining text after the last bracket
-                        if or_group:
-                            parsed_or_tags = parse_hydrus_tags(current_tag)
-                            tags.append(parsed_or_tags)
-                        else:
-                            # Strip quotes from main tags (outside OR groups)
-                            stripped_tag = current_tag.strip()
-                            if (stripped_tag.startswith('"') and stripped_tag.endswith('"')) or \
-                               (stripped_tag.startswith("'") and stripped_tag.endswith("'")):
-                                stripped_tag = stripped_tag[1:-1]
-                            tags.append(stripped_tag)
-
-                    # Append additional tags if provided
-                    if additional_tags:
-                        if not isinstance(additional_tags, list):
-                            additional_tags = [additional_tags]
-                        tags.extend(additional_tags)
-
-                    return tags
-                else:
-                    # No OR groups, just split by commas (preserving complex tags)
-                    def split_preserving_complex_tags(text):
-                        """Split text by commas while preserving complex tags"""
-                        if not text:
-                            return []
-
-                        result = []
-                        current_part = ''
-                        in_quotes = False
-                        quote_char = None
-
-                        for char in text:
-                            if (char == '"' or char == "'") and (not in_quotes):
-                                # Start of quoted section - preserve the quotes for now
-                                in_quotes = True
-                                quote_char = char
-                                current_part = char
-                            elif in_quotes and quote_char is not None:
-                                if char == quote_char:
-                                    # End of quoted section - keep the quotes in the result
-                                    in_quotes = False
-                                    current_part += char
-                                    result.append(current_part)
-                                    current_part = ''
-                                elif char == ',':
-                                    # Don't split on commas inside quotes
-                                    current_part += char
-                                else:
-                                    current_part += char
-                            elif char == ',' and not in_quotes:
-                                if current_part.strip():
-                                    result.append(current_part.strip())
-                                    current_part = ''
-                            else:
-                                current_part += char
-
-                        if current_part.strip():
-                            result.append(current_part.strip())
-
-                        return result
-
-                    # Split the query into parts, preserving complex tags
-                    parts = split_preserving_complex_tags(query)
-                    result = []
-
-                    for part in parts:
-                        stripped = part.strip()
-                        if stripped:  # Only add non-empty parts
-                            # Strip quotes from tags to ensure consistent format
-                            if (stripped.startswith('"') and stripped.endswith('"')) or \
-                               (stripped.startswith("'") and stripped.endswith("'")):
-                                inner_content = stripped[1:-1]
-                                result.append(inner_content)
-                            else:
-                                result.append(stripped)
-
-                    # Append additional tags if provided
-                    if additional_tags:
-                        if not isinstance(additional_tags, list):
-                            additional_tags = [additional_tags]
-                        result.extend(additional_tags)
-
-                    return result
+# Tokens of a Hydrus query string. Quotes only wrap a tag when they enclose all of it, so
+# apostrophes inside tags ("character:d'artagnan") stay literal; a double-quoted span inside a
+# tag (title:"foo, bar") keeps its commas; a '[' with no ']' after it is literal, even mid-tag
+# ("character:foo[bar").
+_TAG_TOKEN_RE = re.compile(r"""
+    \s*(?:
+        \[ (?P<group>[^\]]*) \]                        # [tag1, tag2] — an OR group
+      | (?P<quoted> "[^"]*" | '[^']*' ) (?=\s*(?:,|$))   # "a, b" — a whole tag in quotes
+      | (?P<bare> (?:[^,\["]+|"[^"]*"|"|\[(?![^\]]*\]))+ )  # anything else up to the next comma
+    )
+""", re.VERBOSE)
+
+
+def _parse_tag_string(query: str) -> list:
+    """Split one query string into tags and [OR, groups] (see _TAG_TOKEN_RE)."""
+    tags = []
+    for match in _TAG_TOKEN_RE.finditer(query):
+        group, quoted, bare = match.group('group', 'quoted', 'bare')
+        if group is not None:
+            # [tag1, tag2] means OR condition; empty groups ("[]") are dropped
+            or_tags = _parse_tag_string(group)
+            if or_tags:
+                tags.append(or_tags)
+        elif quoted is not None:
+            tags.append(quoted[1:-1])
+        else:
+            stripped = bare.strip()
+            if stripped:  # Only add non-empty parts
+                # Strip quotes from tags to ensure consistent format
+                tags.append(strip_quotes(stripped))
+    return tags
+
+
+@functools.lru_cache(maxsize=512)
+def _parse_tag_string_cached(query: str) -> tuple:
+    """_parse_tag_string, memoized: LLM sessions re-send the same query strings. Frozen all the
+    way down (OR groups become tuples) so no caller can alter the cached result; use
+    _parsed_tags_copy to get the usual lists back."""
+    return tuple(tuple(tag) if isinstance(tag, list) else tag for tag in _parse_tag_string(query))
+
+
+def _parsed_tags_copy(frozen: tuple) -> list:
+    """A fresh list (OR groups as fresh lists) from a _parse_tag_string_cached result."""
+    return [list(tag) if isinstance(tag, tuple) else tag for tag in frozen]
+
+
+def _parse_tag_list(items: list) -> list:
+    """Flatten a list input: string items are tokenized in place, nested lists become OR groups
+    (or a single tag when they hold just one)."""
+    result = []
+    for item in items:
+        if isinstance(item, str):
+            if ',' in item or '[' in item or '"' in item or "'" in item:
+                result.extend(_parse_tag_string(item))
             else:
-                result = []
-                if additional_tags:
-                    if not isinstance(additional_tags, list):
-                        additional_tags = [additional_tags]
-                    result.extend(additional_tags)
-                return result
+                # Plain tag (the usual ["tag1", "tag2"] input): nothing to split or unquote
+                stripped = item.strip()
+                if stripped:
+                    result.append(stripped)
+        elif isinstance(item, list):
+            parsed = _parse_tag_list(item)
+            if len(parsed) == 1:
+                result.append(parsed[0])
+            elif parsed:
+                result.append(parsed)
+    return result
+
+
+def parse_hydrus_tags(query, additional_tags=None):
+    """Parse Hydrus query string into proper tag structure
+
+    Args:
+        query: The query string (or list of strings / nested lists) to parse
+        additional_tags: Optional list of tags (or a single tag) to append to the result
+    """
+    # Normalized once: a single tag becomes a one-item list
+    extra = additional_tags if isinstance(additional_tags, list) else (
+        [additional_tags] if additional_tags else [])
+
+    if not query:
+        return list(extra)
+
+    # Plain strings are the overwhelmingly common input, so they're dispatched first with an exact
+    # type check; str subclasses still parse via the isinstance fallback
+    if type(query) is str:
+        result = _parsed_tags_copy(_parse_tag_string_cached(query))
+    elif isinstance(query, list):
+        result = _parse_tag_list(query)
+    elif isinstance(query, str):
+        result = _parsed_tags_copy(_parse_tag_string_cached(str(query)))
+    else:
+        result = []
+
+    result.extend(extra)
+    return result
+
+
+def _walk_pages(pages_list: list):
+    """Yield every page dict in a get_pages() tree, depth-first in display order (a page before
+    its nested pages, then its next sibling). Iterative, so deep notebook nesting can't hit the
+    recursion limit."""
+    stack = [iter(pages_list)]
+    while stack:
+        for page_info in stack[-1]:
+            if not isinstance(page_info, dict):
+                continue
+            yield page_info
+            if 'pages' in page_info:
+                # Descend now; the parent's iterator resumes once this subtree is exhausted
+                stack.append(iter(page_info['pages'] or ()))
+                break
+        else:
+            stack.pop()
 
 
 def find_page_by_name(pages_list: list, tab_name: str) -> dict | None:
-    """Recursively search for a page by name (case-insensitive)
+    """Search the page tree for a page by name or title (case-insensitive)
     
     Args:
         pages_list: List of page dictionaries from get_pages() response
@@ -394,26 +564,16 @@ def find_page_by_name(pages_list: list, tab_name: str) -> dict | None:
     Returns:
         Page dictionary if found, None otherwise
     """
-    for page_info in pages_list:
-        if not isinstance(page_info, dict):
-            continue
-        
-        name = page_info.get('name', '')
-        title = page_info.get('title', '')
-        
-        if (tab_name.lower() == name.lower()) or (tab_name.lower() == title.lower()):
+    needle = tab_name.lower()
+    for page_info in _walk_pages(pages_list):
+        if needle == page_info.get('name', '').lower() or needle == page_info.get('title', '').lower():
             return page_info
-        
-        if 'pages' in page_info:
-            nested_page = find_page_by_name(page_info['pages'], tab_name)
-            if nested_page:
-                return nested_page
     
     return None
 
 
 def extract_tabs_from_pages(pages_list: list, return_keys: bool = False) -> tuple[list, list]:
-    """Extract tab names and optionally keys from pages
+    """Extract tab names and optionally keys from pages (including nested pages)
     
     Args:
         pages_list: List of page dictionaries
@@ -425,10 +585,7 @@ def extract_tabs_from_pages(pages_list: list, return_keys: bool = False) -> tupl
     tabs = []
     tab_keys = []
     
-    for page_info in pages_list:
-        if not isinstance(page_info, dict):
-            continue
-        
+    for page_info in _walk_pages(pages_list):
         name = page_info.get('name', page_info.get('title', f"Page {page_info.get('id', 'unknown')}"))
         tabs.append(name)
         
@@ -436,11 +593,6 @@ def extract_tabs_from_pages(pages_list: list, return_keys: bool = False) -> tupl
             page_key = page_info.get('page_key')
             if page_key:
                 tab_keys.append(page_key)
-        
-        if 'pages' in page_info:
-            nested_tabs, nested_keys = extract_tabs_from_pages(page_info['pages'], return_keys)
-            tabs.extend(nested_tabs)
-            tab_keys.extend(nested_keys)
     
     return tabs, tab_keys
 
@@ -459,8 +611,6 @@ def get_file_path(client_obj, file_id: int) -> dict | None:
         Dictionary with 'path', 'filetype', and 'size' keys, or None if file not found locally
         or if the API key doesn't have 'See Local Paths' permission.
     """
-    import httpx
-    
     try:
         # Get the API URL and access key from the client object
         # The hydrus_api.Client stores these as api_url and access_key (public attributes)
@@ -471,22 +621,24 @@ def get_file_path(client_obj, file_id: int) -> dict | None:
             "Hydrus-Client-API-Access-Key": access_key
         }
         
-        # Make synchronous request for simplicity
-        with httpx.Client() as http_client:
-            response = http_client.get(
-                f"{api_url}/get_files/file_path?file_id={file_id}",
-                headers=headers,
-                timeout=30.0
-            )
-            
-            if response.status_code == 200:
-                return response.json()
-            elif response.status_code == 404:
-                return None
-            elif response.status_code == 403:
-                return None
-            else:
-                return None
+        # Go through the client's own requests.Session: client instances are cached per
+        # (url, apikey), so its keep-alive pool is reused across the per-file calls instead of
+        # opening (and tearing down) a fresh HTTP connection for every file
+        response = client_obj.session.get(
+            f"{api_url}/get_files/file_path",
+            params={"file_id": file_id},
+            headers=headers,
+            timeout=30.0
+        )
+        
+        if response.status_code == 200:
+            return response.json()
+        elif response.status_code == 404:
+            return None
+        elif response.status_code == 403:
+            return None
+        else:
+            return None
     except Exception:
         return None
 
@@ -513,13 +665,8 @@ def safe_int_convert(value, default: int = 0) -> int:
     if value is None or value == "":
         return default
     
-    # Convert to string and strip whitespace
-    value_str = str(value).strip()
-    
-    # Strip quotes if present (models often send quoted numbers)
-    if (value_str.startswith('"') and value_str.endswith('"')) or \
-       (value_str.startswith("'") and value_str.endswith("'")):
-        value_str = value_str[1:-1]
+    # Convert to string, strip whitespace and quotes (models often send quoted numbers)
+    value_str = strip_quotes(str(value).strip())
     
     # Try to convert to int
     try:
@@ -552,6 +699,14 @@ def safe_bool_convert(value, default: bool = False) -> bool:
     return bool(value) if value is not None else default
 
 
+def _file_id_from_str(value: str) -> int | None:
+    """One file ID token ('123', ' "123" ') as an int, or None if it isn't a non-negative integer."""
+    token = value.strip().strip('"').strip("'")
+    # isdecimal(), not a bare int(): int() would also take '+5', '-5' and '1_000'; and unlike
+    # isdigit() it rejects characters such as '²' that int() then fails to convert
+    return int(token) if token.isdecimal() else None
+
+
 def parse_file_ids(file_ids) -> list[int]:
     """Parse file IDs from various input formats into a list of integers.
     
@@ -577,9 +732,9 @@ def parse_file_ids(file_ids) -> list[int]:
             if isinstance(fid, int):
                 result.append(fid)
             elif isinstance(fid, str):
-                fid_stripped = fid.strip().strip('"').strip("'")
-                if fid_stripped.isdigit():
-                    result.append(int(fid_stripped))
+                fid_int = _file_id_from_str(fid)
+                if fid_int is not None:
+                    result.append(fid_int)
         return result
     
     # Handle string input
@@ -589,11 +744,19 @@ def parse_file_ids(file_ids) -> list[int]:
         if content.startswith('[') and content.endswith(']'):
             content = content[1:-1]
         
-        # Split by comma and convert each part
-        for fid in content.split(','):
-            fid = fid.strip().strip('"').strip("'")
-            if fid.isdigit():
-                result.append(int(fid))
+        parts = content.split(',')
+        result = None
+        if '-' not in content and '+' not in content and '_' not in content:
+            try:
+                # Common case, a clean "1, 2, 3" list: one C-level map(int) pass (int() ignores
+                # the surrounding whitespace itself; the signs and '_' that it would also take,
+                # e.g. '-0', '+5' or '1_000', are kept off this path)
+                result = list(map(int, parts))
+            except ValueError:
+                pass
+        if result is None:
+            # Quotes, blanks, junk or signs somewhere: check each part on its own
+            result = [fid for fid in map(_file_id_from_str, parts) if fid is not None]
     
     return result
 
@@ -612,26 +775,59 @@ def validate_client(client_name: str) -> tuple[hydrus_api.Client, None] | tuple[
     
     client_obj = get_client_by_name(client_name)
     if not client_obj:
-        available_clients = [c['name'] for c in load_clients_from_secret()]
-        return None, f"❌ Error: Could not connect to client '{client_name}'. Available clients: {', '.join(available_clients)}"
+        # The joined name list is built once per HYDRUS_CLIENTS value, not on every failed lookup
+        return None, f"❌ Error: Could not connect to client '{client_name}'. Available clients: {_clients_cache()[2]}"
     
     return client_obj, None
 
 
-def get_page_list(client_obj) -> tuple[list | None, str | None]:
-    """Get and normalize page list from client.
-    
-    Args:
-        client_obj: Hydrus API client object
-        
-    Returns:
-        Tuple of (page_list, error_message). If successful, error_message is None.
-    """
+# api_url -> (time.monotonic() of the fetch, normalized page list, lowercased name/title -> page).
+# A burst of tab tools (list the tabs, then send to / focus one) shares one get_pages() round-trip;
+# the tab layout rarely changes within a few seconds, and a failed page operation invalidates it.
+_PAGES_CACHE: dict[str, tuple[float, list, dict[str, dict]]] = {}
+_PAGES_CACHE_TTL = 3.0
+
+
+def invalidate_page_list(client_obj) -> None:
+    """Drop the client's cached page list so the next get_page_list() re-fetches it."""
+    _PAGES_CACHE.pop(client_obj.api_url, None)
+
+
+def _build_page_index(page_list: list) -> dict[str, dict]:
+    """Map every page's lowercased name and title to the page, in one walk of the tree. The first
+    page (in find_page_by_name's search order) wins a shared name, so lookups agree with it."""
+    index: dict[str, dict] = {}
+    for page_info in _walk_pages(page_list):
+        for label in (page_info.get('name', ''), page_info.get('title', '')):
+            if isinstance(label, str):
+                index.setdefault(label.lower(), page_info)
+    return index
+
+
+# Bounded repr for error messages: an unexpected get_pages() payload can be a large tree, and
+# str(obj)[:200] would render all of it just to keep the first 200 characters
+_SHORT_REPR = reprlib.Repr()
+_SHORT_REPR.maxlevel = 3
+_SHORT_REPR.maxdict = _SHORT_REPR.maxlist = 10
+_SHORT_REPR.maxstring = _SHORT_REPR.maxother = 200
+
+
+def _short_repr(obj) -> str:
+    return _SHORT_REPR.repr(obj)
+
+
+def _page_list_entry(client_obj) -> tuple[tuple[float, list, dict[str, dict]] | None, str | None]:
+    """The client's _PAGES_CACHE entry, fetching get_pages() if it is missing or expired."""
+    cached = _PAGES_CACHE.get(client_obj.api_url)
+    if cached is not None and time.monotonic() - cached[0] <= _PAGES_CACHE_TTL:
+        return cached, None
+
     try:
+        fetched_at = time.monotonic()
         pages_response = client_obj.get_pages()
         
         if not isinstance(pages_response, dict) or 'pages' not in pages_response:
-            return None, f"❌ Error: Unexpected response format from get_pages(). Expected dict with 'pages' key, got {type(pages_response).__name__}. Response: {str(pages_response)[:200]}"
+            return None, f"❌ Error: Unexpected response format from get_pages(). Expected dict with 'pages' key, got {type(pages_response).__name__}. Response: {_short_repr(pages_response)}"
         
         page_list = pages_response['pages']
         
@@ -641,9 +837,10 @@ def get_page_list(client_obj) -> tuple[list | None, str | None]:
         elif isinstance(page_list, dict):
             page_list = [page_list]
         else:
-            return None, f"❌ Error: Unexpected response format for 'pages' in get_pages(). Expected list or dict, got {type(page_list).__name__}. Response: {str(page_list)[:200]}"
+            return None, f"❌ Error: Unexpected response format for 'pages' in get_pages(). Expected list or dict, got {type(page_list).__name__}. Response: {_short_repr(page_list)}"
         
-        return page_list, None
+        entry = _PAGES_CACHE[client_obj.api_url] = (fetched_at, page_list, _build_page_index(page_list))
+        return entry, None
         
     except AttributeError as e:
         return None, f"❌ Error: Method not found in client API: {e}"
@@ -651,6 +848,43 @@ def get_page_list(client_obj) -> tuple[list | None, str | None]:
         return None, f"❌ Error: Failed to get pages: {str(e)}"
 
 
+def get_page_list(client_obj) -> tuple[list | None, str | None]:
+    """Get and normalize page list from client (cached for _PAGES_CACHE_TTL seconds).
+    
+    Args:
+        client_obj: Hydrus API client object
+        
+    Returns:
+        Tuple of (page_list, error_message). If successful, error_message is None.
+    """
+    entry, error = _page_list_entry(client_obj)
+    return (entry[1], None) if entry is not None else (None, error)
+
+
+def find_tab(client_obj, tab_name: str) -> tuple[dict | None, str | None]:
+    """Find a tab by name or title (case-insensitive) in the client's page list.
+    
+    The lookup is a dict hit in the index built alongside the cached page list. Since that list
+    may be a few seconds old, a miss re-fetches it once before giving up: the tab may have been
+    opened after the list was cached.
+    
+    Returns:
+        Tuple of (page_info, error_message). page_info is None if no tab matched.
+    """
+    needle = tab_name.lower()
+    entry, error = _page_list_entry(client_obj)
+    if error:
+        return None, error
+    page_info = entry[2].get(needle)
+    if page_info is None:
+        invalidate_page_list(client_obj)
+        entry, error = _page_list_entry(client_obj)
+        if error:
+            return None, error
+        page_info = entry[2].get(needle)
+    return page_info, None
+
+
 def detect_file_type_from_path(file_path: str) -> dict:
     """Detect file type from file path extension.
     
@@ -1,5 +1,7 @@
 from __future__ import annotations
 
+import asyncio
+import heapq
 import json
 import os
 import tempfile
@@ -9,6 +11,7 @@ import cv2
 import httpx
 import hydrus_api
 import numpy as np
+import requests
 from mcp.server.fastmcp import FastMCP
 from mcp.server.fastmcp.utilities.types import Image
 from pydantic import Field
@@ -61,7 +64,8 @@ from .functions import (
     get_client_by_name, parse_hydrus_tags, get_tags_summary, get_tags, get_viewing_stat,
     format_timestamp, extract_tags_by_service, format_single_metadata,
     get_audio_codec_config, build_ffmpeg_cmd, extract_audio_from_video,
-    send_to_stt_api, format_transcription_result
+    send_to_stt_api, format_transcription_result, strip_quotes, reload_clients,
+    search_files_cached, clear_search_cache, call_hydrus
 )
 
 # Initialize MCP server - NO PROMPT PARAMETER!
@@ -93,6 +97,22 @@ mcp.tool()(hydrus_show_files)
 mcp.tool()(hydrus_inspect_files)
 mcp.tool()(hydrus_transcribe_audio)
 
+# Seconds hydrus_available_clients waits for a client's get_api_version() before skipping it
+_PROBE_TIMEOUT = 3.0
+
+
+class _TimeoutSession(requests.Session):
+    """A requests.Session that gives every request a default timeout (hydrus_api sets none)."""
+
+    def __init__(self, timeout: float):
+        super().__init__()
+        self.timeout = timeout
+
+    def request(self, *args, **kwargs):
+        kwargs.setdefault("timeout", self.timeout)
+        return super().request(*args, **kwargs)
+
+
 @mcp.tool()
 async def hydrus_available_clients() -> str:
     """Check which Hydrus clients are available for use.
@@ -105,18 +125,23 @@ async def hydrus_available_clients() -> str:
     if not clients:
         return "❌ Error: No Hydrus clients configured. Set HYDRUS_CLIENTS environment variable with client credentials."
 
-    result = ""
-
-    available = []
-    for client in clients:
-        try:
-            api_client = hydrus_api.Client(access_key=client["apikey"], api_url=client["url"])
-            # Try a simple API call to verify connection
-            version = api_client.get_api_version()
-            result += f", {client['name']}"
-            available.append(client['name'])
-        except Exception as e:
-            pass
+    def probe(client):
+        # Try a simple API call to verify connection. The session times the request out itself:
+        # abandoning only the await would leave a hung client's probe holding a default-executor
+        # thread for good, one more on every call
+        with _TimeoutSession(_PROBE_TIMEOUT) as session:
+            api_client = hydrus_api.Client(access_key=client["apikey"], api_url=client["url"], session=session)
+            api_client.get_api_version()
+        return client["name"]
+
+    # Probe every client at once on worker threads, so the wait is the slowest client's rather
+    # than the sum of all of them; each probe is also capped, so a client that hangs (rather than
+    # refusing the connection) counts as unavailable instead of stalling the whole tool. The
+    # wait_for bounds a server that keeps trickling bytes past the per-read timeout.
+    results = await asyncio.gather(
+        *(asyncio.wait_for(asyncio.to_thread(probe, client), timeout=_PROBE_TIMEOUT) for client in clients),
+        return_exceptions=True)
+    available = [name for name in results if not isinstance(name, BaseException)]
 
     if not available:
         return "❌ Error: No clients could be connected. Check your credentials and network settings."
@@ -125,7 +150,19 @@ async def hydrus_available_clients() -> str:
 
 
 @mcp.tool()
-async def hydrus_available_tag_services(client_name: Annotated[str, Field(description="The name of the Hydrus client. Required.")] = "") -> str:
+async def hydrus_reload_clients() -> str:
+    """Reload the Hydrus client configuration and forget cached connections and tag service keys.
+
+    Use this after the Hydrus setup changed (e.g. a tag service was added or renamed, or a client was restarted on a new address).
+    """
+    clients = reload_clients()
+    if not clients:
+        return "❌ Error: No Hydrus clients configured. Set HYDRUS_CLIENTS environment variable with client credentials."
+    return f"✅ Reloaded {len(clients)} client(s): {', '.join(client['name'] for client in clients)}"
+
+
+@mcp.tool()
+async def hydrus_available_tag_services(client_name: Annotated[str, Field(description="The name of the Hydrus client, or several comma-separated names to check them all at once. Required.")] = "") -> str:
     """Get available tag services for a specific Hydrus client.
 
     This function retrieves the list of tag services configured in a specified Hydrus client.
@@ -133,22 +170,30 @@ async def hydrus_available_tag_services(client_name: Annotated[str, Field(descri
 
     Use this function to discover which tag services are available for searching and filtering.
     Tag services can be used with other functions to narrow down searches or limit results to a specific tag service.
+    Pass several comma-separated client names to get the services of each of them in one call (one line per client).
     """
+    # "a, b" lists several clients (unless a single client is literally named that): query them
+    # concurrently, one result line each, instead of making the caller issue one tool call per client
+    if "," in client_name and get_client_by_name(client_name) is None:
+        names = [name.strip() for name in client_name.split(",") if name.strip()]
+        if len(names) > 1:
+            results = await asyncio.gather(*(hydrus_available_tag_services(name) for name in names))
+            return "\n".join(results)
+
     client_obj, error = validate_client(client_name)
     if error:
         return error
 
     try:
         # Get services from the client and extract names instead of keys
-        services_dict = client_obj.get_services()
+        services_dict = await call_hydrus(client_obj, client_obj.get_services)
         service_names = [service_info['name'] for service_info in services_dict['services'].values()]
 
         if not service_names:
             return f"❌ Error: No tag services found for client '{client_name}'"
 
         result = f"✅ Available tag services for {client_name}: "
-        for name in service_names:
-            result += f", '{name}'"
+        result += "".join(f", '{name}'" for name in service_names)
 
         return result.strip()
 
@@ -172,10 +217,10 @@ async def hydrus_search_tags(
         return "❌ Error: Search query is required"
 
     try:
-        service_key = str(get_service_key_by_name(client_obj, tag_service))
+        service_key = str(await call_hydrus(client_obj, get_service_key_by_name, client_obj, tag_service))
 
         # Execute the search
-        results = client_obj.search_tags(search=search, tag_service_key=service_key)
+        results = await call_hydrus(client_obj, client_obj.search_tags, search=search, tag_service_key=service_key)
 
         # Format the output
         result = f"✅ Tag Search Results for '{search}' (from {client_name}) format 'tag_name'(count): "
@@ -197,16 +242,15 @@ async def hydrus_search_tags(
         if total_tags > trs_int:
             result += f" (Showing {trs_int} of {total_tags} tags due to limit parameter)"
 
-            # Sort tags by count descending for consistent ordering
-            sorted_tags = sorted(tags_list, key=lambda x: x.get('count', 0), reverse=True)
-            tags_to_show = sorted_tags[:trs_int]
+            # Top tags by count, descending (ties keep search order, same as a stable sort). nlargest
+            # keeps a heap of trs_int entries instead of sorting every match
+            tags_to_show = heapq.nlargest(trs_int, tags_list, key=lambda x: x.get('count', 0))
         else:
             tags_to_show = tags_list
 
-        for tag_info in tags_to_show:
-            tag_name = tag_info.get('value', 'unknown')
-            count = tag_info.get('count', 0)
-            result += f", '{tag_name}'({count})"
+        # Joined once rather than grown with += per tag (quadratic copying on big result sets)
+        result += "".join(f", '{tag_info.get('value', 'unknown')}'({tag_info.get('count', 0)})"
+                          for tag_info in tags_to_show)
 
         return result.strip()
 
@@ -258,12 +302,12 @@ async def hydrus_query(
         }
 
         if tag_service and tag_service != "all known tags":
-            service_key = get_service_key_by_name(client_obj, tag_service)
+            service_key = await call_hydrus(client_obj, get_service_key_by_name, client_obj, tag_service)
             if service_key:
                 search_params["tag_service_key"] = [service_key]
 
-        # Execute the search
-        file_ids = client_obj.search_files(**search_params)
+        # Execute the search (an identical search from the last few seconds is served from cache)
+        file_ids = await call_hydrus(client_obj, search_files_cached, client_obj, **search_params)
 
         try:
             file_ids = file_ids["file_ids"]
@@ -295,6 +339,10 @@ async def hydrus_query(
         return json.dumps({"error": str(e)})
 
 
+# hydrus_get_tags content types, in the order the error message lists them
+_VALID_CONTENT_TYPES = ("file_ids", "query", "page_key")
+
+
 def _coverage_note(tag_service, diag):
     """Render get_tags_summary diagnostics as text — only when something didn't fully account,
     so a clean run stays quiet. Surfaces WHICH files came back without tags and what their
@@ -333,9 +381,8 @@ async def hydrus_get_tags(
         return "❌ Error: Content is required (query, file IDs, or page key)"
 
     # Validate content_type parameter
-    valid_content_types = ["file_ids", "query", "page_key"]
-    if content_type not in valid_content_types:
-        return f"❌ Error: Invalid content_type '{content_type}'. Valid options are: {', '.join(valid_content_types)}"
+    if content_type not in _VALID_CONTENT_TYPES:
+        return f"❌ Error: Invalid content_type '{content_type}'. Valid options are: {', '.join(_VALID_CONTENT_TYPES)}"
 
     try:
         # Convert trs using safe conversion (needed for both query and file_ids content types)
@@ -354,7 +401,7 @@ async def hydrus_get_tags(
                 # (the true total is always reported); limit<=0 computes over the full match set.
                 tags = parse_hydrus_tags(content)
 
-                tag_service_key = str(get_service_key_by_name(client_obj, tag_service))
+                tag_service_key = str(await call_hydrus(client_obj, get_service_key_by_name, client_obj, tag_service))
 
                 search_params = {
                     "tags": tags,
@@ -363,7 +410,7 @@ async def hydrus_get_tags(
                 }
 
                 # Execute the search
-                file_ids_response = client_obj.search_files(**search_params)
+                file_ids_response = await call_hydrus(client_obj, search_files_cached, client_obj, **search_params)
                 file_ids = file_ids_response['file_ids']
                 result_count = len(file_ids)   # TRUE total match count
 
@@ -376,11 +423,11 @@ async def hydrus_get_tags(
                 # Check threshold for summary view
                 if trs_int < result_count:
                     result_limit_int = safe_int_convert(result_limit, 150)
-                    summary_result, diag = get_tags_summary(
-                        client_obj, file_ids=sample_ids, tag_service=tag_service)
-                    total_distinct = len(summary_result)
-                    if result_limit_int > 0 and total_distinct > result_limit_int:
-                        summary_result = summary_result[:result_limit_int]
+                    # Top-k selected inside get_tags_summary (Counter.most_common), not sliced here
+                    summary_result, diag = await call_hydrus(client_obj, get_tags_summary,
+                        client_obj, file_ids=sample_ids, tag_service=tag_service,
+                        result_limit=result_limit_int)
+                    total_distinct = diag["distinct_tags"]
                     sampled = len(sample_ids)
                     sample_note = ("" if sampled >= result_count else
                                    f" The distribution below is a SAMPLE over the first {sampled} of "
@@ -402,36 +449,25 @@ async def hydrus_get_tags(
         elif content_type == "page_key":
             # Handle page key - get page info and extract file IDs
             try:
-                page_info_result = await hydrus_get_page_info(client_name, content)
-                if not page_info_result.startswith("✅"):
-                    return f"❌ Error: Failed to retrieve page information for page key '{content}'. {page_info_result}"
-
-                # Parse the page info result to extract file IDs
-                try:
-                    # Extract the JSON part from the result string
-                    start_idx = page_info_result.find('{')
-                    end_idx = page_info_result.rfind('}')
-                    if start_idx == -1 or end_idx == -1:
-                        return "❌ Error: Could not parse page information. Expected JSON format not found."
-
-                    json_str = page_info_result[start_idx:end_idx+1]
-                    page_info = json.loads(json_str)
-
-                    # Check if this is a media page with file IDs
-                    if not page_info.get('is_media_page', False):
-                        return f"❌ Error: Page key '{content}' does not contain media files. Only media pages can have tags retrieved."
-
-                    # Extract file IDs from the media section
-                    media = page_info.get('media', {})
-                    hash_ids = media.get('hash_ids', [])
-                    if not hash_ids:
-                        return f"❌ Error: No file IDs found in page key '{content}'"
-
-                    file_ids = hash_ids
-                    result_count = len(file_ids)
-
-                except json.JSONDecodeError as e:
-                    return f"❌ Error: Could not parse page information JSON - {str(e)}. Raw response: {page_info_result}"
+                # Use the raw get_page_info() response directly rather than formatting it through
+                # hydrus_get_page_info and scanning the text back out for its JSON
+                page_info_response = await call_hydrus(client_obj, get_page_info, client_obj, content)
+                if not page_info_response:
+                    return f"❌ Error: Failed to retrieve page information for page key '{content}'. Did you actually use a page key from hydrus_list_tabs with return_page_keys set to 'true'?"
+                page_info = page_info_response.get('page_info', page_info_response)
+
+                # Check if this is a media page with file IDs
+                if not page_info.get('is_media_page', False):
+                    return f"❌ Error: Page key '{content}' does not contain media files. Only media pages can have tags retrieved."
+
+                # Extract file IDs from the media section
+                media = page_info.get('media', {})
+                hash_ids = media.get('hash_ids', [])
+                if not hash_ids:
+                    return f"❌ Error: No file IDs found in page key '{content}'"
+
+                file_ids = hash_ids
+                result_count = len(file_ids)
         
                 # Handle case where no file IDs were found
                 if not file_ids:
@@ -447,18 +483,17 @@ async def hydrus_get_tags(
         # Get tags using the existing get_tags function (with summary logic)
         if trs_int < len(file_ids):
             result_limit_int = safe_int_convert(result_limit, 150)
-            summary_result, diag = get_tags_summary(
-                client_obj, file_ids=file_ids, tag_service=tag_service)
-            total_distinct = len(summary_result)
-            if result_limit_int > 0 and total_distinct > result_limit_int:
-                summary_result = summary_result[:result_limit_int]
+            summary_result, diag = await call_hydrus(client_obj, get_tags_summary,
+                client_obj, file_ids=file_ids, tag_service=tag_service,
+                result_limit=result_limit_int)
+            total_distinct = diag["distinct_tags"]
             cover_note = _coverage_note(tag_service, diag)
             result = (f"The {len(file_ids)} given file ids are above the trs threshold {trs}, so "
                       f"here is a tag-count summary (showing the top {len(summary_result)} of "
                       f"{total_distinct} distinct tags by count).{cover_note} ")
             result = result + str(summary_result)
         else:
-            data = get_tags(client_obj, file_ids=file_ids, tag_service=tag_service)
+            data = await call_hydrus(client_obj, get_tags, client_obj, file_ids=file_ids, tag_service=tag_service)
             result = f"Found {len(data)} results: "
             result = result + str(data)
 
@@ -470,6 +505,12 @@ async def hydrus_get_tags(
         return f"❌ Error: {str(e)}"
 
 
+# hydrus_get_file_metadata filter keys, and the subsets the lighter metadata requests can serve
+_METADATA_FILTER_KEYS = frozenset({'file_id', 'hash', 'size', 'mime', 'dimensions', 'duration', 'views', 'viewtime', 'last_viewed', 'time_modified', 'tags'})
+_IDENTIFIER_KEYS = frozenset({'file_id', 'hash'})
+_BASIC_INFO_KEYS = frozenset({'file_id', 'hash', 'size', 'mime', 'dimensions', 'duration'})
+
+
 @mcp.tool()
 async def hydrus_get_file_metadata(
     client_name: Annotated[str, Field(description="Name of the Hydrus client")] = "",
@@ -504,7 +545,6 @@ async def hydrus_get_file_metadata(
         # Parse filter keys early to determine if we can use only_return_identifiers optimization
         filter_keys = []
         tags_services = None
-        valid_keys = {'file_id', 'hash', 'size', 'mime', 'dimensions', 'duration', 'views', 'viewtime', 'last_viewed', 'time_modified', 'tags'}
         
         if filter:
             # Parse comma-separated filter keys
@@ -517,7 +557,7 @@ async def hydrus_get_file_metadata(
                 else:
                     filter_keys.append(fk)
             
-            filter_keys = [k for k in filter_keys if k in valid_keys or k == 'tags']
+            filter_keys = [k for k in filter_keys if k in _METADATA_FILTER_KEYS]
             if tags_services:
                 filter_keys.append('tags')
         
@@ -531,11 +571,11 @@ async def hydrus_get_file_metadata(
         if filter:
             # Check for only_return_identifiers optimization (highest priority)
             # Valid when filter contains only 'file_id' and/or 'hash'
-            if set(filter_keys).issubset({'file_id', 'hash'}):
+            if set(filter_keys) <= _IDENTIFIER_KEYS:
                 use_only_return_identifiers = True
             # Check for only_return_basic_information optimization
             # Valid when filter contains only basic file info fields
-            elif set(filter_keys).issubset({'file_id', 'hash', 'size', 'mime', 'dimensions', 'duration'}):
+            elif set(filter_keys) <= _BASIC_INFO_KEYS:
                 use_only_return_basic_information = True
 
         # Determine what to pass to get_file_metadata
@@ -546,11 +586,11 @@ async def hydrus_get_file_metadata(
                 return "❌ Error: No valid hashes provided"
             # Pass hashes directly to get_file_metadata (Hydrus API accepts hashes)
             if use_only_return_identifiers:
-                metadata = client_obj.get_file_metadata(hashes=hash_list, only_return_identifiers=True)
+                metadata = await call_hydrus(client_obj, client_obj.get_file_metadata, hashes=hash_list, only_return_identifiers=True)
             elif use_only_return_basic_information:
-                metadata = client_obj.get_file_metadata(hashes=hash_list, only_return_basic_information=True)
+                metadata = await call_hydrus(client_obj, client_obj.get_file_metadata, hashes=hash_list, only_return_basic_information=True)
             else:
-                metadata = client_obj.get_file_metadata(hashes=hash_list)
+                metadata = await call_hydrus(client_obj, client_obj.get_file_metadata, hashes=hash_list)
             # For display purposes, use the hashes as identifiers
             identifiers = hash_list
             identifier_type = "hash"
@@ -561,18 +601,18 @@ async def hydrus_get_file_metadata(
                 return "❌ Error: No valid file IDs provided"
             # Pass file IDs to get_file_metadata
             if use_only_return_identifiers:
-                metadata = client_obj.get_file_metadata(file_ids=file_ids_list, only_return_identifiers=True)
+                metadata = await call_hydrus(client_obj, client_obj.get_file_metadata, file_ids=file_ids_list, only_return_identifiers=True)
             elif use_only_return_basic_information:
-                metadata = client_obj.get_file_metadata(file_ids=file_ids_list, only_return_basic_information=True)
+                metadata = await call_hydrus(client_obj, client_obj.get_file_metadata, file_ids=file_ids_list, only_return_basic_information=True)
             else:
-                metadata = client_obj.get_file_metadata(file_ids=file_ids_list)
+                metadata = await call_hydrus(client_obj, client_obj.get_file_metadata, file_ids=file_ids_list)
             identifiers = file_ids_list
             identifier_type = "ID"
 
         # Handle filter parameter
         if filter:
             if not filter_keys:
-                return f"❌ Error: No valid filter keys provided. Valid options: {', '.join(valid_keys)}"
+                return f"❌ Error: No valid filter keys provided. Valid options: {', '.join(_METADATA_FILTER_KEYS)}"
             
             # OPTIMIZATION: When filtering only for file_id or hash, return compact comma-separated list
             if set(filter_keys) == {'file_id'} or set(filter_keys) == {'hash'}:
@@ -602,47 +642,49 @@ async def hydrus_get_file_metadata(
             # Extract metadata list from response (handles both dict with 'metadata' key and direct list)
             file_metadata_list = metadata.get('metadata', []) if isinstance(metadata, dict) else (metadata if isinstance(metadata, list) else [])
             
-            for idx, file_metadata in enumerate(file_metadata_list):
-                if isinstance(file_metadata, dict) and idx < len(identifiers):
-                    result += format_single_metadata(
-                        file_metadata, identifiers[idx], identifier_type, filter_keys, tags_services, TAG_TYPE_FOR_FILTER
-                    )
+            result += "".join(
+                format_single_metadata(
+                    file_metadata, identifier, identifier_type, filter_keys, tags_services, TAG_TYPE_FOR_FILTER
+                )
+                for identifier, file_metadata in zip(identifiers, file_metadata_list)
+                if isinstance(file_metadata, dict)
+            )
             if not file_metadata_list:
                 result += "filter requires metadata list in response"
             return result.strip()
 
-        # Full metadata output (default behavior)
-        result = f"✅ File Metadata for {len(identifiers)} file(s) (from {client_name}):"
+        # Full metadata output (default behavior). Collected as parts and joined once: the dump can
+        # run to many thousands of lines, and += re-copies the whole string for each one
+        parts = [f"✅ File Metadata for {len(identifiers)} file(s) (from {client_name}):"]
         
         if isinstance(metadata, list):
             # Multiple files returned
-            for idx, file_metadata in enumerate(metadata):
-                identifier = identifiers[idx]
-                result += f"\n\n{'='*60}"
-                result += f"\nFile {identifier_type} {identifier}:"
-                result += f"\n{'='*60}"
+            for identifier, file_metadata in zip(identifiers, metadata):
+                parts.append(f"\n\n{'='*60}")
+                parts.append(f"\nFile {identifier_type} {identifier}:")
+                parts.append(f"\n{'='*60}")
                 if isinstance(file_metadata, dict):
                     for key, value in file_metadata.items():
                         if isinstance(value, dict):
-                            result += f"\n- {key}: {json.dumps(value)}"
+                            parts.append(f"\n- {key}: {json.dumps(value)}")
                         else:
-                            result += f"\n- {key}: {value}"
+                            parts.append(f"\n- {key}: {value}")
                 else:
-                    result += f"\n- Raw data: {json.dumps(file_metadata) if isinstance(file_metadata, (dict, list)) else str(file_metadata)}"
+                    parts.append(f"\n- Raw data: {json.dumps(file_metadata) if isinstance(file_metadata, (dict, list)) else str(file_metadata)}")
         else:
             # Single file or dict response
             identifier = identifiers[0] if len(identifiers) == 1 else identifiers
-            result += f"\n\nFile {identifier_type}(s) {identifier}:"
+            parts.append(f"\n\nFile {identifier_type}(s) {identifier}:")
             if isinstance(metadata, dict):
                 for key, value in metadata.items():
                     if isinstance(value, dict):
-                        result += f"\n- {key}: {json.dumps(value)}"
+                        parts.append(f"\n- {key}: {json.dumps(value)}")
                     else:
-                        result += f"\n- {key}: {value}"
+                        parts.append(f"\n- {key}: {value}")
             else:
-                result += f"\n- Raw data: {json.dumps(metadata) if isinstance(metadata, (dict, list)) else str(metadata)}"
+                parts.append(f"\n- Raw data: {json.dumps(metadata) if isinstance(metadata, (dict, list)) else str(metadata)}")
 
-        return result.strip()
+        return "".join(parts).strip()
 
     except Exception as e:
         return f"❌ Error: {str(e)}"
@@ -681,7 +723,7 @@ async def hydrus_send(
                 tags_dict = json.loads(service_names_to_additional_tags)
                 service_keys_to_additional_tags = {}
                 for service_name, tags_list in tags_dict.items():
-                    service_key = get_service_key_by_name(client_obj, service_name)
+                    service_key = await call_hydrus(client_obj, get_service_key_by_name, client_obj, service_name)
                     if service_key:
                         service_keys_to_additional_tags[service_key] = tags_list
 
@@ -802,17 +844,21 @@ async def hydrus_send(
                         filename_without_extension, _ = os.path.splitext(unquote(file_link.split('/')[-1]))
                         filename_tag = "filename:" + filename_without_extension.lower()
                         # Add to local service if available
-                        local_key = get_service_key_by_name(client_obj, "local")
+                        local_key = await call_hydrus(client_obj, get_service_key_by_name, client_obj, "local")
                         if local_key:
                             if local_key not in tags_to_add:
                                 tags_to_add[local_key] = []
                             tags_to_add[local_key].append(filename_tag)
 
-                    client_obj.add_url(url=file_link, destination_page_name=destination_page_name, show_destination_page=True, service_keys_to_additional_tags=tags_to_add if tags_to_add else None)
+                    await call_hydrus(client_obj, client_obj.add_url, url=file_link, destination_page_name=destination_page_name, show_destination_page=True, service_keys_to_additional_tags=tags_to_add if tags_to_add else None)
                     added_count += 1
                 except Exception as e:
                     failed_links.append(file_link)
 
+            if added_count:
+                # Imported files can match searches made before them
+                clear_search_cache()
+
             if failed_links:
                 failed_links_str = ", ".join(failed_links[:5])  # Limit to first 5 to avoid overflow
                 if len(failed_links) > 5:
@@ -833,13 +879,15 @@ async def hydrus_send(
                     filename_without_extension, _ = os.path.splitext(unquote(link.split('/')[-1]))
                     filename_tag = "filename:" + filename_without_extension.lower()
                     # Add to local service if available
-                    local_key = get_service_key_by_name(client_obj, "local")
+                    local_key = await call_hydrus(client_obj, get_service_key_by_name, client_obj, "local")
                     if local_key:
                         if local_key not in tags_to_add:
                             tags_to_add[local_key] = []
                         tags_to_add[local_key].append(filename_tag)
 
-                client_obj.add_url(url=link, destination_page_name=destination_page_name, show_destination_page=True, service_keys_to_additional_tags=tags_to_add if tags_to_add else None)
+                await call_hydrus(client_obj, client_obj.add_url, url=link, destination_page_name=destination_page_name, show_destination_page=True, service_keys_to_additional_tags=tags_to_add if tags_to_add else None)
+                # Imported files can match searches made before them
+                clear_search_cache()
                 return f"✅ Successfully sent link '{link}' to Hydrus"
 
             except Exception as e:
@@ -916,12 +964,14 @@ async def hydrus_add_tags(
             return "❌ Error: No valid tags provided"
         
         # Get service key for the target tag service
-        service_key = get_service_key_by_name(client_obj, target_tag_service)
+        service_key = await call_hydrus(client_obj, get_service_key_by_name, client_obj, target_tag_service)
         if not service_key:
             return f"❌ Error: Tag service '{target_tag_service}' not found on client '{client_name}'"
         
         # Add tags to files
-        client_obj.add_tags(file_ids=file_ids_list, service_keys_to_tags={str(service_key): tags_list})
+        await call_hydrus(client_obj, client_obj.add_tags, file_ids=file_ids_list, service_keys_to_tags={str(service_key): tags_list})
+        # Tag searches may now match different files
+        clear_search_cache()
         
         return f"✅ The following {len(tags_list)} tags were added to the tag service '{target_tag_service}' on client '{client_name}' to the file ids {file_ids_list}"
     
@@ -964,10 +1014,7 @@ async def hydrus_execute(
         return error
     
     # Strip quotes from action (models often send quoted strings)
-    action_stripped = action.strip()
-    if (action_stripped.startswith('"') and action_stripped.endswith('"')) or \
-       (action_stripped.startswith("'") and action_stripped.endswith("'")):
-        action_stripped = action_stripped[1:-1]
+    action_stripped = strip_quotes(action.strip())
     
     # Handle 'list' action - list all available methods
     if action_stripped.lower() == "list":
@@ -1056,7 +1103,12 @@ async def hydrus_execute(
     try:
         # Get and call the method
         method = getattr(client_obj, method_name)
-        result = method(**method_kwargs)
+        try:
+            result = await call_hydrus(client_obj, method, **method_kwargs)
+        finally:
+            # Any whitelisted method may change files, tags or archive/trash state (even one that
+            # raised may have been applied), so cached searches can no longer be trusted
+            clear_search_cache()
         
         # Format the result
         if isinstance(result, (dict, list)):
@@ -38,6 +38,7 @@ from ..functions import (
     get_audio_codec_config,
     send_to_stt_api,
     format_transcription_result,
+    call_hydrus,
 )
 
 
@@ -86,7 +87,7 @@ async def hydrus_show_files(
             USE_FILE_PATH_METHOD = True  # Change to False to use get_file method
             
             if USE_FILE_PATH_METHOD:
-                file_path_info = get_file_path(client_obj, file_id)
+                file_path_info = await call_hydrus(client_obj, get_file_path, client_obj, file_id)
                 
                 if file_path_info and 'path' in file_path_info:
                     # Use file path - more efficient for large files
@@ -158,7 +159,7 @@ async def hydrus_show_files(
                             results.append(Image(data=buffer.tobytes(), format="png"))
                 else:
                     # Fallback to get_file method if path not available
-                    file_data = client_obj.get_file(file_id=file_id)
+                    file_data = await call_hydrus(client_obj, client_obj.get_file, file_id=file_id)
                     file_bytes = file_data.content
                     
                     # Detect format from content using helper function
@@ -216,7 +217,7 @@ async def hydrus_show_files(
                             results.append(Image(data=b"", format="png"))
             else:
                 # Use get_file method (original approach)
-                file_data = client_obj.get_file(file_id=file_id)
+                file_data = await call_hydrus(client_obj, client_obj.get_file, file_id=file_id)
                 file_bytes = file_data.content
                 
                 # Detect format from content using helper function
@@ -345,7 +346,7 @@ async def hydrus_inspect_files(
             ]
             
             # Try to use file path method first (more efficient for large files)
-            file_path_info = get_file_path(client_obj, file_id)
+            file_path_info = await call_hydrus(client_obj, get_file_path, client_obj, file_id)
             use_file_path = file_path_info and 'path' in file_path_info
             
             if use_file_path:
@@ -403,7 +404,7 @@ async def hydrus_inspect_files(
                     })
             else:
                 # Fallback to get_file method if path not available
-                file_data = client_obj.get_file(file_id=file_id)
+                file_data = await call_hydrus(client_obj, client_obj.get_file, file_id=file_id)
                 file_bytes = file_data.content
                 
                 # Detect mime type from content using helper function
@@ -591,7 +592,7 @@ async def hydrus_transcribe_audio(
 
     try:
         # Try to use file path method first (more efficient for large files)
-        file_path_info = get_file_path(client_obj, file_id)
+        file_path_info = await call_hydrus(client_obj, get_file_path, client_obj, file_id)
         use_file_path = file_path_info and 'path' in file_path_info
 
         if use_file_path:
@@ -661,7 +662,7 @@ async def hydrus_transcribe_audio(
         else:
             # Fallback to get_file method if path not available
             log_message("Using fallback get_file method (file path not available)")
-            file_data = client_obj.get_file(file_id=file_id)
+            file_data = await call_hydrus(client_obj, client_obj.get_file, file_id=file_id)
             file_bytes = file_data.content
             log_message(f"Downloaded file from Hydrus: {len(file_bytes) / (1024*1024):.1f}MB")
 
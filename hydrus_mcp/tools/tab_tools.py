@@ -17,13 +17,16 @@ from pydantic import Field
 from typing import Annotated
 
 from ..functions import (
+    call_hydrus,
     extract_tabs_from_pages,
-    find_page_by_name,
+    find_tab,
     get_page_info,
     get_page_list,
     get_service_key_by_name,
+    invalidate_page_list,
     parse_file_ids,
     parse_hydrus_tags,
+    retry_transient,
     safe_bool_convert,
     validate_client,
 )
@@ -45,17 +48,16 @@ async def hydrus_get_page_info(
         return "❌ Error: Page key is required"
 
     try:
-        page_info = get_page_info(client_obj, page_key)
+        page_info = await call_hydrus(client_obj, get_page_info, client_obj, page_key)
         if not page_info:
             return "❌ Error: Failed to retrieve page information. Did you actually use a page key from hydrus_list_tabs with return_page_keys set to 'true'?"
 
         # Format the output
         result = f"✅ Page Information for key '{page_key}' (from {client_name}):"
-        for key, value in page_info.items():
-            if isinstance(value, dict):
-                result += f"- {key}: {json.dumps(value)}"
-            else:
-                result += f"- {key}: {value}"
+        result += "".join(
+            f"- {key}: {json.dumps(value)}" if isinstance(value, dict) else f"- {key}: {value}"
+            for key, value in page_info.items()
+        )
 
         return result.strip()
 
@@ -78,7 +80,7 @@ async def hydrus_list_tabs(
     return_tab_keys = safe_bool_convert(return_tab_keys, False)
 
     # Get pages from the client using get_page_list helper
-    page_list, error = get_page_list(client_obj)
+    page_list, error = await call_hydrus(client_obj, get_page_list, client_obj)
     if error:
         return error
 
@@ -89,11 +91,12 @@ async def hydrus_list_tabs(
     if not tabs:
         return "❌ Error: No open tabs found"
 
-    for i, tab in enumerate(tabs):
-        if return_tab_keys and i < len(tab_keys) and tab_keys[i]:
-            result += f", '{tab}' (key: {tab_keys[i]})"
-        else:
-            result += f", '{tab}'"
+    # Joined once rather than grown with += per tab
+    result += "".join(
+        f", '{tab}' (key: {tab_keys[i]})" if return_tab_keys and i < len(tab_keys) and tab_keys[i]
+        else f", '{tab}'"
+        for i, tab in enumerate(tabs)
+    )
 
     return result.strip()
 
@@ -110,13 +113,11 @@ async def hydrus_focus_on_tab(
     if not tab_name.strip():
         return "❌ Error: Tab name is required"
 
-    # Get pages from the client using get_page_list helper
-    page_list, error = get_page_list(client_obj)
+    # Find the tab in the client's (briefly cached) page list
+    target_page, error = await call_hydrus(client_obj, find_tab, client_obj, tab_name)
     if error:
         return error
 
-    target_page = find_page_by_name(page_list, tab_name)
-
     if not target_page:
         return f"❌ Error: Tab '{tab_name}' not found for client '{client_name}'"
 
@@ -127,14 +128,37 @@ async def hydrus_focus_on_tab(
 
     # Focus on the page using the Hydrus API
     try:
-        client_obj.focus_page(page_id)
+        await call_hydrus(client_obj, client_obj.focus_page, page_id)
         return f"✅ Successfully focused on tab '{tab_name}' for client '{client_name}'"
     except AttributeError as e:
         return f"❌ Error: Method not found in client API: {e}"
     except Exception as e:
+        # The cached page list may be stale (e.g. the tab was closed); re-fetch it next time
+        invalidate_page_list(client_obj)
         return f"❌ Error: Failed to focus on tab: {str(e)}"
 
 
+# File ids per add_files_to_page request: a query can match tens of thousands of files, and one
+# request carrying all of them can stall or time out
+_ADD_FILES_CHUNK = 1024
+
+
+def _add_files_in_chunks(client_obj, page_key: str, file_ids: list) -> tuple[int, Exception | None]:
+    """Add file_ids to the page in order, _ADD_FILES_CHUNK at a time.
+
+    Returns (files sent, None), or (files sent before the failure, the exception).
+    """
+    sent = 0
+    for i in range(0, len(file_ids), _ADD_FILES_CHUNK):
+        chunk = file_ids[i:i + _ADD_FILES_CHUNK]
+        try:
+            client_obj.add_files_to_page(page_key=page_key, file_ids=chunk)
+        except Exception as e:
+            return sent, e
+        sent += len(chunk)
+    return sent, None
+
+
 async def hydrus_send_to_tab(
     client_name: Annotated[str, Field(description="Name of the Hydrus client")] = "",
     tab_name: Annotated[str, Field(description="Name of the tab to send files to")] = "",
@@ -162,64 +186,73 @@ async def hydrus_send_to_tab(
     is_query = safe_bool_convert(is_query, False)
 
     try:
-        # Get the content based on whether it's a query or file IDs
-        file_ids = []
-        result_count = 0
-
         if is_query:
-            # Handle query - execute search and get file IDs
-            try:
-                tags = parse_hydrus_tags(content)
-                tag_service_key = get_service_key_by_name(client_obj, tag_service)
-                search_params = {
-                    "tags": tags,
-                    "file_sort_type": 13,
-                    "tag_service_key": tag_service_key
-                }
-
-                query_result = client_obj.search_files(**search_params)
-
-                # Parse the response to get file IDs
-                query_response = query_result["file_ids"]
-                if isinstance(query_response, dict) and 'file_ids' in query_response:
-                    file_ids = query_response['file_ids']
-                else:
-                    file_ids = query_response
-
-                result_count = len(file_ids)
-
-                if result_count == 0:
-                    return f"❌ No files found for query '{content}'"
-            except Exception as e:
-                return f"❌ Error: Failed to execute query - {str(e)}, {tags}, {query_result}, {tag_service_key}"
+            file_ids, error = await _query_file_ids(client_obj, content, tag_service)
+            if error:
+                return error
         else:
-            # Handle direct file IDs using parse_file_ids function
+            # Plain file ids, the common case: no tag parsing or service lookup needed
             file_ids = parse_file_ids(content)
-            result_count = len(file_ids)
+        return await _send_file_ids(client_obj, client_name, tab_name, file_ids)
 
-        # Get pages from the client using get_page_list helper
-        page_list, error = get_page_list(client_obj)
-        if error:
-            return error
+    except AttributeError as e:
+        return f"❌ Error: Method not found in client API: {e}"
+    except Exception as e:
+        return f"❌ Error: {str(e)}"
 
-        target_page = find_page_by_name(page_list, tab_name)
 
-        if not target_page:
-            return f"❌ Error: Tab '{tab_name}' not found for client '{client_name}'"
+async def _query_file_ids(client_obj, content, tag_service: str) -> tuple[list, str | None]:
+    """Run a hydrus_send_to_tab query; returns (file_ids, None) or ([], error message).
 
-        # Get the page ID to focus on
-        page_key = target_page.get('page_key')
-        if not page_key:
-            return f"❌ Error: Could not get page key for tab '{tab_name}'"
+    A dropped connection or a busy client DB is retried with backoff before giving up.
+    """
+    tags = parse_hydrus_tags(content)
+    try:
+        tag_service_key = await call_hydrus(client_obj, retry_transient, get_service_key_by_name, client_obj, tag_service)
+        query_result = await call_hydrus(
+            client_obj, retry_transient, client_obj.search_files,
+            tags=tags, file_sort_type=13, tag_service_key=tag_service_key
+        )
+    except Exception as e:
+        return [], f"❌ Error: Failed to execute query {tags} - {str(e)}"
 
-        # Send files to the tab using the Hydrus API
-        try:
-            client_obj.add_files_to_page(page_key=page_key, file_ids=file_ids)
-            return f"✅ Successfully sent {result_count} files to tab '{tab_name}'"
-        except Exception as e:
-            return f"❌ Error: {str(e)}"
+    # Parse the response to get file IDs
+    query_response = query_result["file_ids"]
+    if isinstance(query_response, dict) and 'file_ids' in query_response:
+        file_ids = query_response['file_ids']
+    else:
+        file_ids = query_response
 
-    except AttributeError as e:
-        return f"❌ Error: Method not found in client API: {e}"
-    except Exception as e:
-        return f"❌ Error: {str(e)}"
+    if len(file_ids) == 0:
+        return [], f"❌ No files found for query '{content}'"
+    return file_ids, None
+
+
+async def _send_file_ids(client_obj, client_name: str, tab_name: str, file_ids: list) -> str:
+    """Add file_ids to the named tab; returns the hydrus_send_to_tab reply."""
+    # Drop repeated ids (order kept) so they are neither sent nor counted twice
+    file_ids = list(dict.fromkeys(file_ids))
+    result_count = len(file_ids)
+
+    # Find the tab in the client's (briefly cached) page list
+    target_page, error = await call_hydrus(client_obj, find_tab, client_obj, tab_name)
+    if error:
+        return error
+
+    if not target_page:
+        return f"❌ Error: Tab '{tab_name}' not found for client '{client_name}'"
+
+    # Get the page ID to focus on
+    page_key = target_page.get('page_key')
+    if not page_key:
+        return f"❌ Error: Could not get page key for tab '{tab_name}'"
+
+    # Send files to the tab using the Hydrus API
+    sent, e = await call_hydrus(client_obj, _add_files_in_chunks, client_obj, page_key, file_ids)
+    if e is None:
+        return f"✅ Successfully sent {result_count} files to tab '{tab_name}'"
+    # The cached page list may be stale (e.g. the tab was closed); re-fetch it next time
+    invalidate_page_list(client_obj)
+    if sent:
+        return f"❌ Error: Sent {sent} of {result_count} files to tab '{tab_name}' before failing: {str(e)}"
+    return f"❌ Error: {str(e)}"
@@ -0,0 +1,34 @@
+import pytest
+
+from hydrus_mcp.functions import parse_file_ids
+
+
+@pytest.mark.parametrize("file_ids, expected", [
+    (5, [5]),
+    ("7", [7]),
+    ("1, 2, 3", [1, 2, 3]),
+    ("[4,5]", [4, 5]),
+    ("", []),
+    ("1, ,2", [1, 2]),
+    ('1, "2", \'3\'', [1, 2, 3]),
+    ("1, x, 3", [1, 3]),
+    (["1", " 2 ", 3, "x"], [1, 2, 3]),
+    # Only plain digit tokens are ids: signs, '_' separators and non-decimal digits are dropped
+    ("+5, 1_000, 6", [6]),
+    ("1,-2,3", [1, 3]),
+    ("-0, 5", [5]),
+    ('"-0", 5', [5]),
+    (["-0"], []),
+    (["+5", "1_000", "-3", "²", "4"], [4]),
+    ("², 4", [4]),
+])
+def test_parse_file_ids(file_ids, expected):
+    assert parse_file_ids(file_ids) == expected
+
+
+def test_parse_file_ids_token_does_not_depend_on_neighbours():
+    # The fast map(int) path and the per-token path must agree on every token
+    for token in ("-0", "+5", "1_000", "07", " 8 "):
+        alone = parse_file_ids(token)
+        assert parse_file_ids(f"{token}, 9") == alone + [9]
+        assert parse_file_ids([token]) == alone
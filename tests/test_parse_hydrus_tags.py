@@ -0,0 +1,45 @@
+import pytest
+
+from hydrus_mcp.functions import parse_hydrus_tags
+
+
+@pytest.mark.parametrize("query, expected", [
+    # Unchanged from the character-scanning parser
+    ("a, b", ["a", "b"]),
+    ("  a ,b  ,", ["a", "b"]),
+    ("a,,b", ["a", "b"]),
+    ("a", ["a"]),
+    ("", []),
+    ("   ", []),
+    ("[a, b], c", [["a", "b"], "c"]),
+    ("[a, b]", [["a", "b"]]),
+    ("[single]", [["single"]]),
+    ("[a,b],[c,d]", [["a", "b"], ["c", "d"]]),
+    ('"a, b", c', ["a, b", "c"]),
+    ("'a, b', c", ["a, b", "c"]),
+    ('[a, "b, c"], d', [["a", "b, c"], "d"]),
+    ("system:inbox, [x, y], z", ["system:inbox", ["x", "y"], "z"]),
+    # A '[' with no ']' after it is part of the tag
+    ("character:foo[bar", ["character:foo[bar"]),
+    ("a, b[", ["a", "b["]),
+    ("[a, b", ["[a", "b"]),
+    (["a, b", ["c", "d"], ["e"]], ["a", "b", ["c", "d"], "e"]),
+    (["x"], ["x"]),
+    (None, []),
+    (5, []),
+    # Changed: quotes only count when they wrap the whole tag
+    ('title:"foo, bar"', ['title:"foo, bar"']),
+    ("character:d'artagnan, blue eyes", ["character:d'artagnan", "blue eyes"]),
+    ('"unterminated, b', ['"unterminated', "b"]),
+    # Changed: an OR group with no tags is dropped instead of yielding [[]]
+    ("[,]", []),
+])
+def test_parse_hydrus_tags(query, expected):
+    assert parse_hydrus_tags(query) == expected
+
+
+def test_parse_hydrus_tags_results_are_independent():
+    first = parse_hydrus_tags("[a, b], c")
+    first[0].append("extra")
+    first.append("more")
+    assert parse_hydrus_tags("[a, b], c") == [["a", "b"], "c"]